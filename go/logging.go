@@ -31,6 +31,9 @@ const (
 	ColorRedBold = "\033[91;1m" // CRITICAL/FATAL
 )
 
+// timestampLayout renders YYYY-MM-DD HH:MM:SS.mmm (milliseconds truncated, zero-padded)
+const timestampLayout = "2006-01-02 15:04:05.000"
+
 // LogLevel represents log severity levels
 type LogLevel string
 
@@ -43,9 +46,16 @@ const (
 	LevelFatal    LogLevel = "FATAL"
 )
 
+// stdoutIsTerminal caches whether stdout is a terminal so it isn't checked on every log line
+var stdoutIsTerminal = isTerminal()
+
+// levelLabels holds each level name padded to 8 characters (and colored on a terminal),
+// built once instead of formatted per log line
+var levelLabels = buildLevelLabels()
+
 // getColor returns the ANSI color code for a log level
 func getColor(level LogLevel) string {
-	if !isTerminal() {
+	if !stdoutIsTerminal {
 		return ""
 	}
 	switch level {
@@ -62,10 +72,26 @@ func getColor(level LogLevel) string {
 
 // isTerminal checks if stdout is a terminal
 func isTerminal() bool {
-	fileInfo, _ := os.Stdout.Stat()
+	fileInfo, err := os.Stdout.Stat()
+	if err != nil {
+		return false
+	}
 	return (fileInfo.Mode() & os.ModeCharDevice) != 0
 }
 
+// buildLevelLabels precomputes the padded, optionally colored label for every log level
+func buildLevelLabels() map[LogLevel]string {
+	labels := make(map[LogLevel]string)
+	for _, level := range []LogLevel{LevelDebug, LevelInfo, LevelWarning, LevelError, LevelCritical, LevelFatal} {
+		label := fmt.Sprintf("%-8s", string(level)) // Pad to 8 characters
+		if color := getColor(level); color != "" {
+			label = color + label + ColorReset
+		}
+		labels[level] = label
+	}
+	return labels
+}
+
 // formatLogMessage formats a log message in standardized format
 // Format: YYYY-MM-DD HH:MM:SS.mmm | LEVEL    | module:function:line - message
 func formatLogMessage(level LogLevel, message string, skip int) string {
@@ -101,16 +127,12 @@ func formatLogMessage(level LogLevel, message string, skip int) string {
 	}
 
 	// Format timestamp: 2025-10-20 21:30:45.123
-	timestamp := fmt.Sprintf("%04d-%02d-%02d %02d:%02d:%02d.%03d",
-		now.Year(), now.Month(), now.Day(),
-		now.Hour(), now.Minute(), now.Second(),
-		now.Nanosecond()/1000000)
-
-	// Apply color to level name if terminal
-	levelStr := fmt.Sprintf("%-8s", string(level)) // Pad to 8 characters
-	color := getColor(level)
-	if color != "" {
-		levelStr = color + levelStr + ColorReset
+	timestamp := now.Format(timestampLayout)
+
+	// Look up the precomputed (padded, colored if terminal) level name
+	levelStr, ok := levelLabels[level]
+	if !ok {
+		levelStr = fmt.Sprintf("%-8s", string(level))
 	}
 
 	return fmt.Sprintf("%s | %s | %s - %s", timestamp, levelStr, location, message)
@@ -172,6 +194,10 @@ func (w *RotatingFileWriter) Write(p []byte) (n int, err error) {
 	w.mu.Lock()
 	defer w.mu.Unlock()
 
+	if w.file == nil {
+		return 0, os.ErrClosed
+	}
+
 	// Check if we need to rotate
 	if w.currentSize+int64(len(p)) > w.maxBytes {
 		if err := w.rotate(); err != nil {
@@ -216,12 +242,28 @@ func (w *RotatingFileWriter) rotate() error {
 	return w.openFile()
 }
 
+// reuse updates the rotation size and backup count of the writer, reopening the file
+// if the writer was closed
+func (w *RotatingFileWriter) reuse(maxBytes int64, backupCount int) error {
+	w.mu.Lock()
+	defer w.mu.Unlock()
+
+	w.maxBytes = maxBytes
+	w.backupCount = backupCount
+	if w.file == nil {
+		return w.openFile()
+	}
+	return nil
+}
+
 func (w *RotatingFileWriter) Close() error {
 	w.mu.Lock()
 	defer w.mu.Unlock()
 
 	if w.file != nil {
-		return w.file.Close()
+		err := w.file.Close()
+		w.file = nil
+		return err
 	}
 	return nil
 }
@@ -265,7 +307,20 @@ func ConfigureLoggingWithConfig(config LogConfig) *StandardLogger {
 
 	// Setup file logging with rotation if log file is specified
 	var fileWriter *RotatingFileWriter
-	if config.LogFile != "" {
+	if config.LogFile != "" && defaultLogger != nil && defaultLogger.fileWriter != nil &&
+		defaultLogger.fileWriter.filename == config.LogFile {
+		// Reuse the existing writer for the same file so reconfiguring never opens a second
+		// descriptor with its own size counter, which would rotate the file out from under it
+		fileWriter = defaultLogger.fileWriter
+		// The new logger owns the writer from here on, so closing the old logger leaves it open
+		defaultLogger.fileWriter = nil
+		if err := fileWriter.reuse(config.MaxBytes, config.BackupCount); err != nil {
+			log.Printf("Failed to setup file logging: %v", err)
+			fileWriter = nil
+		} else {
+			writer = io.MultiWriter(os.Stdout, fileWriter)
+		}
+	} else if config.LogFile != "" {
 		var err error
 		fileWriter, err = NewRotatingFileWriter(config.LogFile, config.MaxBytes, config.BackupCount)
 		if err != nil {
@@ -0,0 +1,71 @@
+package logging
+
+import (
+	"os"
+	"path/filepath"
+	"strings"
+	"testing"
+)
+
+func TestReconfigureAfterCloseKeepsFileLogging(t *testing.T) {
+	logFile := filepath.Join(t.TempDir(), "app.log")
+	config := LogConfig{ServiceName: "test", LogFile: logFile}
+
+	l := ConfigureLoggingWithConfig(config)
+	l.Info("before close")
+	if err := l.Close(); err != nil {
+		t.Fatalf("Close: %v", err)
+	}
+
+	l = ConfigureLoggingWithConfig(config)
+	defer l.Close()
+	l.Info("after reconfigure")
+
+	data, err := os.ReadFile(logFile)
+	if err != nil {
+		t.Fatalf("ReadFile: %v", err)
+	}
+	for _, want := range []string{"before close", "after reconfigure"} {
+		if !strings.Contains(string(data), want) {
+			t.Errorf("log file missing %q:\n%s", want, data)
+		}
+	}
+}
+
+func TestReconfigureSameFileReusesWriter(t *testing.T) {
+	logFile := filepath.Join(t.TempDir(), "app.log")
+
+	first := ConfigureLoggingWithConfig(LogConfig{LogFile: logFile})
+	shared := first.fileWriter
+	second := ConfigureLoggingWithConfig(LogConfig{LogFile: logFile, MaxBytes: 1024, BackupCount: 2})
+	defer second.Close()
+
+	if shared != second.fileWriter {
+		t.Fatal("reconfiguring the same file opened a second writer")
+	}
+	if second.fileWriter.maxBytes != 1024 || second.fileWriter.backupCount != 2 {
+		t.Errorf("limits not updated: maxBytes=%d backupCount=%d",
+			second.fileWriter.maxBytes, second.fileWriter.backupCount)
+	}
+}
+
+func TestCloseReplacedLoggerKeepsFileLogging(t *testing.T) {
+	logFile := filepath.Join(t.TempDir(), "app.log")
+	config := LogConfig{ServiceName: "test", LogFile: logFile}
+
+	old := ConfigureLoggingWithConfig(config)
+	cur := ConfigureLoggingWithConfig(config)
+	defer cur.Close()
+	if err := old.Close(); err != nil {
+		t.Fatalf("Close: %v", err)
+	}
+	cur.Info("after old close")
+
+	data, err := os.ReadFile(logFile)
+	if err != nil {
+		t.Fatalf("ReadFile: %v", err)
+	}
+	if !strings.Contains(string(data), "after old close") {
+		t.Errorf("log file missing %q:\n%s", "after old close", data)
+	}
+}
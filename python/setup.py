@@ -15,7 +15,7 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/SurrealityAI/surreality-logging",
-    packages=find_packages(),
+    packages=find_packages(include=["surreality_logging", "surreality_logging.*"]),
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -32,4 +32,7 @@ setup(
     install_requires=[
         "loguru>=0.7.0",
     ],
+    extras_require={
+        "zstd": ["zstandard>=0.19.0"],
+    },
 )
@@ -11,10 +11,289 @@ This module provides:
 """
 import sys
 import os
+import atexit
+import threading
+import functools
+import traceback
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from loguru import logger
+from loguru._file_sink import FileDateFormatter
 import logging
 
+try:
+    import zstandard
+except ImportError:  # Optional dependency: pip install surreality-logging[zstd]
+    zstandard = None
+
+
+# Format: YYYY-MM-DD HH:MM:SS.mmm | LEVEL    | module:function:line - message
+_FMT_COLOR = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+_FMT_PLAIN = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
+
+# Console format keyed by whether colors are in use
+_LOG_FORMATS = {True: _FMT_COLOR, False: _FMT_PLAIN}
+
+# Cached once so the frame walk in InterceptHandler.emit avoids a module attribute lookup
+_LOGGING_FILE = logging.__file__
+
+# Frames between InterceptHandler.emit and the user's call for a plain ``Logger.info(...)``:
+# emit <- Handler.handle <- Logger.callHandlers <- Logger.handle <- Logger._log <- Logger.info
+_STDLIB_CALLER_DEPTH = 6
+
+# Worker that compresses and prunes rotated log files off the logging thread, created
+# lazily per process so forked workers don't inherit an executor without a thread
+_COMPRESSION_EXECUTOR = None
+_COMPRESSION_EXECUTOR_PID = None
+_PENDING_COMPRESSIONS = []
+
+# Suffix of the zstd dictionaries saved next to the log file (``<log_file>.<dict_id>.zst.dict``)
+# when ``compression_dict`` is used
+_ZSTD_DICT_SUFFIX = ".zst.dict"
+
+# Settings and Loguru handler ids of the sinks added by the last configure_logging call
+_LAST_SINK_CONFIG = None
+_LAST_SINK_IDS = ()
+
+# Stops the periodic flush thread of the file sink added by the last configure_logging call
+_FLUSH_STOP = None
+
+
+@functools.lru_cache(maxsize=None)
+def _loguru_level(levelname: str, levelno: int):
+    """Map a standard library level to the matching Loguru level name (or its number)."""
+    try:
+        return logger.level(levelname).name
+    except ValueError:
+        return levelno
+
+
+class InterceptHandler(logging.Handler):
+    """Logging handler that redirects standard library records to Loguru."""
+
+    logger_opt = logger.opt
+
+    def emit(self, record):
+        # Skip records no Loguru sink will accept before paying for formatting
+        if record.levelno < logger._core.min_level:
+            return
+
+        # Get corresponding Loguru level if it exists
+        level = _loguru_level(record.levelname, record.levelno)
+
+        # Find caller from where originated the logged message. Jump straight to the
+        # usual offset when the frame just below it is still inside the logging module,
+        # otherwise walk up from Handler.handle.
+        try:
+            frame = sys._getframe(_STDLIB_CALLER_DEPTH - 1)
+        except ValueError:
+            frame = None
+        if frame is not None and frame.f_code.co_filename == _LOGGING_FILE:
+            frame, depth = frame.f_back, _STDLIB_CALLER_DEPTH
+        else:
+            frame, depth = sys._getframe(1), 1
+        while frame is not None and frame.f_code.co_filename == _LOGGING_FILE:
+            frame = frame.f_back
+            depth += 1
+
+        log = self.logger_opt(depth=depth, exception=record.exc_info, lazy=True).log
+        if record.args:
+            # Loguru only evaluates lazy arguments, so the message is passed as one: it is
+            # %-formatted only once Loguru's own level and logger.disable() checks have passed
+            log(level, "{}", record.getMessage)
+        else:
+            # Nothing to %-format; without arguments Loguru just calls str() on the message
+            log(level, record.msg)
+
+
+# One handler instance is shared by the root logger and every intercepted logger
+_SHARED_INTERCEPT = InterceptHandler()
+
+
+def _shared_intercept_handler() -> InterceptHandler:
+    """dictConfig handler factory returning the shared InterceptHandler."""
+    return _SHARED_INTERCEPT
+
+
+# logging.config.dictConfig for ``uvicorn.run(..., log_config=UVICORN_LOG_CONFIG)``. Uvicorn's
+# default config installs its own formatters and handlers on its loggers, replacing the
+# interception; this keeps them on the shared InterceptHandler and leaves their levels alone.
+UVICORN_LOG_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        # A module-level function (not a lambda) so the config stays picklable for uvicorn's
+        # spawned workers (workers > 1, reload=True)
+        "intercept": {"()": _shared_intercept_handler},
+    },
+    "loggers": {
+        "uvicorn": {"handlers": ["intercept"], "propagate": False},
+        "uvicorn.error": {"handlers": ["intercept"], "propagate": False},
+        "uvicorn.access": {"handlers": ["intercept"], "propagate": False},
+    },
+}
+
+
+class _BufferedSizeRotation:
+    """
+    Size-based rotation for a buffered Loguru file sink.
+
+    Loguru's built-in size rotation seeks to the end of the file before every write,
+    which flushes the write buffer each time. This tracks the file size itself so
+    writes stay buffered; ``_flush_periodically`` flushes the file on an interval.
+    """
+
+    def __init__(self, max_bytes: int, encoding: str = 'utf-8'):
+        self._max_bytes = max_bytes
+        self._encoding = encoding
+        self._file = None
+        self._size = 0
+        self._carry = None
+
+    def __call__(self, message, file):
+        if file is not self._file:
+            # Freshly opened file: either the initial one (append mode) or the one created
+            # by the last rotation, which so far only holds the message that triggered it
+            self._file = file
+            self._size = os.fstat(file.fileno()).st_size if self._carry is None else self._carry
+            self._carry = None
+
+        # Count bytes like the file size does; only non-ASCII text needs encoding for that
+        size = len(message) if message.isascii() else len(message.encode(self._encoding))
+        if self._size + size > self._max_bytes:
+            self._carry = size
+            return True
+        self._size += size
+        return False
+
+
+def _flush_periodically(handler_id: int, interval: float, stop: threading.Event) -> None:
+    """Flush a buffered file sink every ``interval`` seconds until stopped or removed."""
+    while not stop.wait(interval):
+        handler = logger._core.handlers.get(handler_id)
+        if handler is None:
+            return  # Sink was removed
+        # Loguru writes under the handler lock, or the queue lock with enqueue, and stops
+        # (flushes and closes) the sink under the handler lock; hold both, in that order
+        with handler._protected_lock():
+            if handler._enqueue:
+                with handler._queue_lock:
+                    _flush_sink_file(handler)
+            else:
+                _flush_sink_file(handler)
+
+
+def _flush_sink_file(handler) -> None:
+    # The sink's current file, which after a rotation is the newly opened one
+    file = handler._sink._file
+    if file is not None and not file.closed:
+        file.flush()
+
+
+def _zstd_compress(path: str, dict_data=None, threads: int = -1) -> None:
+    """Compress a rotated log file to ``<path>.zst`` and remove the original."""
+    compressor = zstandard.ZstdCompressor(level=3, threads=threads, dict_data=dict_data)
+    with open(path, 'rb') as f_in, open(path + '.zst', 'wb') as f_out:
+        compressor.copy_stream(f_in, f_out)
+    os.remove(path)
+
+
+def _zip_compress(path: str) -> None:
+    """Compress a rotated log file to ``<path>.zip`` and remove the original."""
+    with zipfile.ZipFile(path + '.zip', 'w', compression=zipfile.ZIP_DEFLATED) as f_out:
+        f_out.write(path, os.path.basename(path))
+    os.remove(path)
+
+
+def _resolve_compression(
+    compression: Optional[str], compression_dict: Optional[bytes] = None, compression_threads: int = -1
+):
+    """Translate the ``compression`` option into something Loguru's file sink accepts."""
+    if compression == "zstd":
+        # Fall back to stdlib compression when the zstd extra isn't installed
+        if zstandard is None:
+            return _zip_compress
+        dict_data = zstandard.ZstdCompressionDict(compression_dict) if compression_dict else None
+        return functools.partial(_zstd_compress, dict_data=dict_data, threads=compression_threads)
+    if compression == "zip":
+        return _zip_compress
+    return compression
+
+
+def _retain_latest(count: int, logs: list) -> None:
+    """
+    Keep the ``count`` most recent of the rotated files Loguru listed, like its integer retention.
+
+    Runs on the compression worker after the compressions submitted before it, so a file Loguru
+    listed uncompressed may since have been replaced by its compressed copy; that copy is
+    counted instead.
+    """
+    existing = set()
+    for file in logs:
+        if file.endswith(_ZSTD_DICT_SUFFIX):
+            continue  # Dictionary needed to decompress the rotated files, not a log
+        for candidate in (file, file + '.zst', file + '.zip'):
+            try:
+                existing.add((-os.stat(candidate).st_mtime, candidate))
+                break
+            except FileNotFoundError:
+                continue
+    for _, file in sorted(existing)[count:]:
+        os.remove(file)
+
+
+def _compression_executor() -> ThreadPoolExecutor:
+    global _COMPRESSION_EXECUTOR, _COMPRESSION_EXECUTOR_PID
+    if _COMPRESSION_EXECUTOR is None or _COMPRESSION_EXECUTOR_PID != os.getpid():
+        _COMPRESSION_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="surreality-logging-compression")
+        _COMPRESSION_EXECUTOR_PID = os.getpid()
+        _PENDING_COMPRESSIONS.clear()
+    return _COMPRESSION_EXECUTOR
+
+
+def _report_background_error(future) -> None:
+    exception = future.exception()
+    if exception is not None:
+        sys.stderr.write("--- Logging error in surreality_logging background compression ---\n")
+        traceback.print_exception(type(exception), exception, exception.__traceback__, file=sys.stderr)
+
+
+def _run_in_background(function):
+    """Wrap a file sink callback so it runs on the compression worker instead of the caller."""
+    def submit(*args):
+        try:
+            future = _compression_executor().submit(function, *args)
+        except RuntimeError:
+            # Interpreter is shutting down and no longer accepts new work
+            function(*args)
+            return
+        future.add_done_callback(_report_background_error)
+        _PENDING_COMPRESSIONS[:] = [f for f in _PENDING_COMPRESSIONS if not f.done()]
+        _PENDING_COMPRESSIONS.append(future)
+    return submit
+
+
+@atexit.register
+def _wait_for_background_compression() -> None:
+    """Block until every submitted compression and retention task has finished."""
+    if _COMPRESSION_EXECUTOR_PID != os.getpid():
+        # Futures inherited across fork() belong to the parent's worker and never finish here
+        return
+    for future in list(_PENDING_COMPRESSIONS):
+        future.exception()
+
+
+def _reset_compression_after_fork() -> None:
+    global _COMPRESSION_EXECUTOR, _COMPRESSION_EXECUTOR_PID
+    _COMPRESSION_EXECUTOR = None
+    _COMPRESSION_EXECUTOR_PID = None
+    _PENDING_COMPRESSIONS.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_compression_after_fork)
+
 
 def configure_logging(
     level: str = "INFO",
@@ -24,13 +303,23 @@ def configure_logging(
     log_file: Optional[str] = None,
     max_bytes: int = 100 * 1024 * 1024,  # 100MB default
     backup_count: int = 5,
-    colorize: bool = True
+    colorize: bool = True,
+    enqueue: bool = True,
+    buffer_size: int = 64 * 1024,
+    flush_interval: float = 1.0,
+    compression: Optional[str] = "zstd",
+    compression_dict: Optional[bytes] = None,
+    compression_threads: int = -1,
+    quiet: bool = False
 ) -> None:
     """
     Configure standardized Python logging for Surreality AI services using Loguru.
 
     Format: YYYY-MM-DD HH:MM:SS.mmm | LEVEL    | module:function:line - message
 
+    Calling this again with the same sink settings keeps the existing sinks and only
+    re-applies standard library interception.
+
     Args:
         level: Logging level (default: "INFO")
         service_name: Service name to include in logs (optional, currently unused)
@@ -41,7 +330,31 @@ def configure_logging(
         log_file: Path to log file (optional). If provided, logs to both console and file with rotation.
         max_bytes: Maximum size per log file in bytes (default: 100MB)
         backup_count: Number of backup files to keep (default: 5)
-        colorize: Whether to use colors in console output (default: True)
+        colorize: Whether to use colors in console output (default: True).
+                  Colors are only used when stdout is a terminal.
+        enqueue: Whether to hand records off to a background queue instead of writing
+                 them on the calling thread (default: True). Records still in the queue
+                 may be lost if the process crashes before they are written.
+        buffer_size: Write buffer size in bytes for the log file (default: 64KB).
+                     Larger buffers mean fewer write() syscalls, but buffered records
+                     are lost if the process crashes before they are flushed.
+        flush_interval: Flush the log file from a background thread every this many seconds
+                        (default: 1.0), bounding how long records stay buffered even when
+                        logging is idle. 0 or None disables it. The file is always flushed
+                        on shutdown and rotation.
+        compression: How rotated log files are compressed (default: "zstd"). "zstd" requires
+                     the ``zstd`` extra and falls back to "zip" without it; any other Loguru
+                     compression format (e.g. "gz", "bz2") or None is passed through.
+                     "zstd" and "zip" run on a background thread so rotation doesn't
+                     block logging.
+        compression_dict: Trained zstd dictionary (see ``train_dictionary``) used when
+                          compressing rotated files with "zstd" (optional). It is saved
+                          as ``<log_file>.<dict_id>.zst.dict``, which is needed to
+                          decompress them; files saved for earlier dictionaries are kept.
+        compression_threads: Worker threads zstd uses to compress a rotated file (default: -1,
+                             one per CPU core). Use 0 to compress on the single background
+                             thread only, leaving the other cores to the service.
+        quiet: Skip the DEBUG-level "logging configured" startup messages (default: False)
 
     Example:
         # Console only with uvicorn interception
@@ -56,49 +369,106 @@ def configure_logging(
             backup_count=10
         )
     """
-    # Remove default logger
-    logger.remove()
+    global _LAST_SINK_CONFIG, _LAST_SINK_IDS, _FLUSH_STOP
 
-    # Define format string matching the requested format
-    # Format: YYYY-MM-DD HH:MM:SS.mmm | LEVEL    | module:function:line - message
-    log_format = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+    # Only colorize when stdout is a terminal; redirected output (files, pipes) stays plain
+    effective_colorize = colorize and hasattr(sys.stdout, 'isatty') and sys.stdout.isatty()
 
-    if not colorize:
-        log_format = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
+    # Keep the existing sinks when nothing about them changed (e.g. configure_logging called
+    # per test or per worker) instead of closing and reopening the console and log file
+    sink_config = (
+        level, effective_colorize, sys.stdout, enqueue, log_file, max_bytes, backup_count,
+        buffer_size, flush_interval, compression, compression_dict, compression_threads,
+    )
+    if sink_config == _LAST_SINK_CONFIG and set(logger._core.handlers) == set(_LAST_SINK_IDS):
+        if intercept_stdlib:
+            intercept_standard_logging(level, additional_loggers)
+        return
+
+    # Remove default logger
+    logger.remove()
+    if _FLUSH_STOP is not None:
+        _FLUSH_STOP.set()
+        _FLUSH_STOP = None
 
     # Add console handler
-    logger.add(
+    sink_ids = [logger.add(
         sys.stdout,
-        format=log_format,
+        format=_LOG_FORMATS[effective_colorize],
         level=level,
-        colorize=colorize
-    )
+        colorize=effective_colorize,
+        enqueue=enqueue
+    )]
 
     # Add rotating file handler if log_file is specified
     if log_file:
-        # Create log directory if it doesn't exist
-        log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir, exist_ok=True)
+        # The log directory is created by Loguru's file sink (os.makedirs(..., exist_ok=True))
+
+        # Compress and prune rotated files on a background thread. Both go through the same
+        # single worker, so retention only runs once the preceding compression has finished.
+        compress = _resolve_compression(compression, compression_dict, compression_threads)
+        retention = backup_count
+        if callable(compress):
+            compress = _run_in_background(compress)
+            retention = _run_in_background(functools.partial(_retain_latest, backup_count))
 
         # Add file handler with rotation
-        logger.add(
+        sink_ids.append(logger.add(
             log_file,
-            format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}",
+            format=_FMT_PLAIN,
             level=level,
-            rotation=max_bytes,  # Rotate when file reaches max_bytes
-            retention=backup_count,  # Keep backup_count old files
-            compression="zip",  # Compress rotated files
-            encoding='utf-8'
-        )
-
-        logger.info(f"File logging enabled: {log_file} (max {max_bytes / (1024*1024):.0f}MB, {backup_count} backups)")
+            rotation=_BufferedSizeRotation(max_bytes, 'utf-8'),  # Rotate when file reaches max_bytes
+            retention=retention,  # Keep backup_count old files
+            compression=compress,  # Compress rotated files
+            encoding='utf-8',
+            buffering=buffer_size,
+            enqueue=enqueue
+        ))
+
+        # Bound how long records can sit in the write buffer, even when logging goes idle
+        if flush_interval:
+            _FLUSH_STOP = threading.Event()
+            threading.Thread(
+                target=_flush_periodically,
+                args=(sink_ids[-1], flush_interval, _FLUSH_STOP),
+                name="surreality-logging-flush",
+                daemon=True,
+            ).start()
+
+        # Keep the dictionary next to the rotated files so they can be decompressed. Each
+        # dictionary gets its own file, so archives made with an earlier one stay readable.
+        if compression == "zstd" and compression_dict and zstandard is not None:
+            dict_id = zstandard.ZstdCompressionDict(compression_dict).dict_id()
+            # Fill in {time} placeholders the way Loguru names the log file itself
+            dict_base = log_file.format_map({"time": FileDateFormatter()})
+            with open(f"{dict_base}.{dict_id}{_ZSTD_DICT_SUFFIX}", 'wb') as f:
+                f.write(compression_dict)
+
+        if not quiet:
+            logger.debug(
+                "File logging enabled: {} (max {:.0f}MB, {} backups)", log_file, max_bytes / (1024*1024), backup_count
+            )
 
     # Configure standard library logging interception if needed
     if intercept_stdlib:
         intercept_standard_logging(level, additional_loggers)
 
-    logger.info("Standardized logging configured with Loguru")
+    _LAST_SINK_CONFIG = sink_config
+    _LAST_SINK_IDS = tuple(sink_ids)
+
+    if not quiet:
+        logger.debug("Standardized logging configured with Loguru")
+
+
+@functools.lru_cache(maxsize=None)
+def _normalize_loggers(logger_specs: tuple, default_level) -> tuple:
+    """Expand logger specs into ``(logger_name, level)`` pairs, uvicorn's loggers first."""
+    return (
+        # Default loggers to intercept (uvicorn)
+        ("uvicorn", default_level),
+        ("uvicorn.error", default_level),
+        ("uvicorn.access", "WARNING"),  # Reduce HTTP request noise
+    ) + tuple(spec if isinstance(spec, tuple) else (spec, default_level) for spec in logger_specs)
 
 
 def intercept_standard_logging(level: str = "INFO", additional_loggers: list = None) -> None:
@@ -121,51 +491,55 @@ def intercept_standard_logging(level: str = "INFO", additional_loggers: list = N
         # Intercept uvicorn + other libraries
         intercept_standard_logging("INFO", additional_loggers=["requests", "httpx", ("boto3", "WARNING")])
     """
-    # Intercept handler that redirects standard logging to loguru
-    class InterceptHandler(logging.Handler):
-        def emit(self, record):
-            # Get corresponding Loguru level if it exists
-            try:
-                level = logger.level(record.levelname).name
-            except ValueError:
-                level = record.levelno
+    # Loguru levels may have been added since the last call
+    _loguru_level.cache_clear()
+
+    # Configure standard library logging to use our intercept handler
+    logging.basicConfig(handlers=[_SHARED_INTERCEPT], level=0, force=True)
 
-            # Find caller from where originated the logged message
-            frame, depth = logging.currentframe(), 2
-            while frame.f_code.co_filename == logging.__file__:
-                frame = frame.f_back
-                depth += 1
+    loggers_to_configure = _normalize_loggers(tuple(additional_loggers or ()), level)
 
-            logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+    # Configure all specified loggers, holding logging's module lock once for the whole
+    # batch (getLogger and setLevel re-acquire it, which is cheap for an RLock we own)
+    with logging._lock:
+        for logger_name, logger_level in loggers_to_configure:
+            logging_logger = logging.getLogger(logger_name)
+            logging_logger.handlers = [_SHARED_INTERCEPT]
+            logging_logger.propagate = False
 
-    # Configure standard library logging to use our intercept handler
-    logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
+            # Convert string level to logging constant
+            if isinstance(logger_level, str):
+                logger_level = logging._nameToLevel.get(logger_level.upper(), logging.INFO)
+            logging_logger.setLevel(logger_level)
 
-    # Default loggers to intercept (uvicorn)
-    loggers_to_configure = [
-        ("uvicorn", level),
-        ("uvicorn.error", level),
-        ("uvicorn.access", "WARNING"),  # Reduce HTTP request noise
-    ]
 
-    # Add additional loggers if specified
-    if additional_loggers:
-        for logger_spec in additional_loggers:
-            if isinstance(logger_spec, tuple):
-                loggers_to_configure.append(logger_spec)
-            else:
-                loggers_to_configure.append((logger_spec, level))
+def train_dictionary(log_files: list, dict_size: int = 100 * 1024) -> bytes:
+    """
+    Train a zstd dictionary from existing log files for ``configure_logging(compression_dict=...)``.
+
+    Log lines from one service are highly repetitive, so a dictionary trained on a sample of
+    them compresses rotated files considerably better than plain zstd at the same level.
+    Requires the ``zstd`` extra.
 
-    # Configure all specified loggers
-    for logger_name, logger_level in loggers_to_configure:
-        logging_logger = logging.getLogger(logger_name)
-        logging_logger.handlers = [InterceptHandler()]
-        logging_logger.propagate = False
+    Args:
+        log_files: Paths of uncompressed log files to sample; each line is one training sample
+        dict_size: Maximum size of the dictionary in bytes (default: 100KB)
+
+    Returns:
+        The trained dictionary as bytes
+
+    Example:
+        compression_dict = train_dictionary(["/var/log/app/app.log"])
+        configure_logging("INFO", log_file="/var/log/app/app.log", compression_dict=compression_dict)
+    """
+    if zstandard is None:
+        raise ImportError("train_dictionary requires zstandard: pip install surreality-logging[zstd]")
 
-        # Convert string level to logging constant
-        if isinstance(logger_level, str):
-            logger_level = getattr(logging, logger_level.upper(), logging.INFO)
-        logging_logger.setLevel(logger_level)
+    samples = []
+    for log_file in log_files:
+        with open(log_file, 'rb') as f:
+            samples.extend(line for line in f if line.strip())
+    return zstandard.train_dictionary(dict_size, samples).as_bytes()
 
 
 def get_logger(name: Optional[str] = None):
@@ -190,4 +564,4 @@ def get_logger(name: Optional[str] = None):
 
 
 # Export the logger directly for convenience
-__all__ = ['logger', 'configure_logging', 'get_logger', 'intercept_standard_logging']
+__all__ = ['logger', 'configure_logging', 'get_logger', 'intercept_standard_logging', 'train_dictionary', 'UVICORN_LOG_CONFIG']
@@ -3,6 +3,7 @@ Basic tests for surreality_logging package.
 """
 import pytest
 from surreality_logging import configure_logging, logger, intercept_standard_logging
+from surreality_logging import _wait_for_background_compression
 
 
 def test_configure_logging():
@@ -24,6 +25,18 @@ def test_logger_levels():
     assert True  # If no exception, test passes
 
 
+def test_configure_logging_is_idempotent():
+    """Test reconfiguring with the same settings keeps the existing sinks."""
+    configure_logging("DEBUG", colorize=False)
+    sinks = set(logger._core.handlers)
+
+    configure_logging("DEBUG", colorize=False)
+    assert set(logger._core.handlers) == sinks
+
+    configure_logging("INFO", colorize=False)
+    assert set(logger._core.handlers) != sinks
+
+
 def test_intercept_standard_logging():
     """Test standard library logging interception."""
     import logging as stdlib_logging
@@ -38,9 +51,344 @@ def test_intercept_standard_logging():
     assert True  # If no exception, test passes
 
 
+def test_intercept_reports_caller():
+    """Test intercepted records point at the stdlib logging caller, not logging internals."""
+    import logging as stdlib_logging
+
+    configure_logging("INFO", colorize=False, additional_loggers=["test_caller"])
+    records = []
+    sink_id = logger.add(lambda message: records.append(message.record), level="INFO")
+    try:
+        stdlib_logging.getLogger("test_caller").info("Hello %s", "world")
+    finally:
+        logger.remove(sink_id)
+
+    assert records[-1]["message"] == "Hello world"
+    assert records[-1]["function"] == "test_intercept_reports_caller"
+
+
+def test_intercept_message_passthrough():
+    """Test intercepted messages keep %-style and brace characters intact."""
+    import logging as stdlib_logging
+
+    configure_logging("INFO", colorize=False, additional_loggers=["test_passthrough"])
+    records = []
+    sink_id = logger.add(lambda message: records.append(message.record["message"]), level="INFO")
+    try:
+        test_logger = stdlib_logging.getLogger("test_passthrough")
+        test_logger.info("No args {placeholder} 100%")
+        test_logger.info("%(name)s=%(value)d {kept}", {"name": "answer", "value": 42})
+    finally:
+        logger.remove(sink_id)
+
+    assert records == ["No args {placeholder} 100%", "answer=42 {kept}"]
+
+
+def test_intercept_skips_filtered_records():
+    """Test records below every sink level are dropped without formatting their arguments."""
+    import logging as stdlib_logging
+
+    class Counted:
+        calls = 0
+
+        def __str__(self):
+            Counted.calls += 1
+            return "counted"
+
+    configure_logging("WARNING", colorize=False, additional_loggers=[("test_gate", "DEBUG")])
+    stdlib_logging.getLogger("test_gate").debug("Dropped %s", Counted())
+
+    assert Counted.calls == 0
+
+
+def test_intercept_defers_formatting_for_disabled_modules():
+    """Test records from modules disabled in loguru are never formatted."""
+    import logging as stdlib_logging
+
+    class Counted:
+        calls = 0
+
+        def __str__(self):
+            Counted.calls += 1
+            return "{counted}"
+
+    configure_logging("INFO", colorize=False, additional_loggers=["test_lazy"])
+    records = []
+    sink_id = logger.add(lambda message: records.append(message.record), level="INFO")
+    try:
+        logger.disable(__name__)
+        stdlib_logging.getLogger("test_lazy").info("Dropped %s", Counted())
+        logger.enable(__name__)
+        stdlib_logging.getLogger("test_lazy").info("Kept %s", Counted())
+    finally:
+        logger.enable(__name__)
+        logger.remove(sink_id)
+
+    assert Counted.calls == 1
+    assert records[-1]["message"] == "Kept {counted}"
+
+
+def test_uvicorn_log_config():
+    """Test UVICORN_LOG_CONFIG keeps uvicorn loggers on the intercept handler across reconfigures."""
+    import logging as stdlib_logging
+    import logging.config
+    from surreality_logging import UVICORN_LOG_CONFIG
+
+    configure_logging("INFO", colorize=False)
+    handler = stdlib_logging.getLogger("uvicorn").handlers[0]
+
+    for _ in range(2):
+        logging.config.dictConfig(UVICORN_LOG_CONFIG)
+
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        assert stdlib_logging.getLogger(name).handlers == [handler]
+    assert stdlib_logging.getLogger("uvicorn.access").level == stdlib_logging.WARNING
+
+
+def test_uvicorn_log_config_is_picklable():
+    """Test UVICORN_LOG_CONFIG survives pickling, as uvicorn does for spawned workers."""
+    import pickle
+    from surreality_logging import UVICORN_LOG_CONFIG
+
+    assert pickle.loads(pickle.dumps(UVICORN_LOG_CONFIG)) == UVICORN_LOG_CONFIG
+
+
+def test_file_logging_rotation(tmp_path):
+    """Test the buffered file sink keeps every record and rotates at max_bytes."""
+    log_file = tmp_path / "logs" / "app.log"
+    configure_logging("INFO", colorize=False, log_file=str(log_file), max_bytes=1024, enqueue=False)
+
+    for i in range(50):
+        logger.info("Rotation message {}", i)
+    logger.remove()
+    _wait_for_background_compression()
+
+    assert log_file.stat().st_size <= 1024
+    assert len(list(log_file.parent.glob("app.*.log.*"))) >= 1
+    assert "Rotation message 49" in log_file.read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("enqueue", [False, True])
+def test_file_logging_flushes_when_idle(tmp_path, enqueue):
+    """Test buffered records reach the file within flush_interval without further writes."""
+    import time
+
+    log_file = tmp_path / "app.log"
+    configure_logging("INFO", colorize=False, log_file=str(log_file), flush_interval=0.05, enqueue=enqueue)
+    try:
+        logger.info("Idle message")
+        logger.complete()
+
+        deadline = time.monotonic() + 2
+        while "Idle message" not in log_file.read_text(encoding="utf-8"):
+            assert time.monotonic() < deadline, "buffered record was never flushed"
+            time.sleep(0.02)
+    finally:
+        logger.remove()
+
+
+@pytest.mark.parametrize("enqueue", [False, True])
+def test_file_logging_flushes_when_idle_after_rotation(tmp_path, enqueue):
+    """Test the record that triggered a rotation is flushed to the new file while idle."""
+    import time
+
+    log_file = tmp_path / "app.log"
+    configure_logging(
+        "INFO", colorize=False, log_file=str(log_file), max_bytes=300, flush_interval=0.05,
+        enqueue=enqueue, quiet=True,
+    )
+    try:
+        i = 0
+        while not list(tmp_path.glob("app.*.log*")):
+            logger.info("Rotating message {}", i)
+            logger.complete()
+            i += 1
+        last = f"Rotating message {i - 1}"
+
+        deadline = time.monotonic() + 2
+        while last not in log_file.read_text(encoding="utf-8"):
+            assert time.monotonic() < deadline, "record written after rotation was never flushed"
+            time.sleep(0.02)
+    finally:
+        logger.remove()
+        _wait_for_background_compression()
+
+
+def test_file_logging_rotation_counts_bytes(tmp_path):
+    """Test max_bytes bounds the file size in bytes for multibyte messages."""
+    log_file = tmp_path / "app.log"
+    configure_logging("INFO", colorize=False, log_file=str(log_file), max_bytes=1024, enqueue=False)
+
+    for i in range(30):
+        logger.info("{} {}", i, "日志" * 100)
+    logger.remove()
+    _wait_for_background_compression()
+
+    assert log_file.stat().st_size <= 1024
+    assert list(tmp_path.glob("app.*.log.*"))
+
+
+def test_file_logging_zstd_compression(tmp_path):
+    """Test rotated files are compressed with zstd and can be decompressed."""
+    zstandard = pytest.importorskip("zstandard")
+
+    log_file = tmp_path / "app.log"
+    configure_logging("INFO", colorize=False, log_file=str(log_file), max_bytes=1024, enqueue=False)
+
+    for i in range(50):
+        logger.info("Compressed message {}", i)
+    logger.remove()
+    _wait_for_background_compression()
+
+    rotated = sorted(tmp_path.glob("app.*.log.zst"))
+    assert rotated
+    with open(rotated[0], "rb") as f:
+        text = zstandard.ZstdDecompressor().stream_reader(f).read().decode("utf-8")
+    assert "Compressed message 0" in text
+
+
+def test_file_logging_zstd_dictionary(tmp_path):
+    """Test archives stay decompressible with their saved dictionary after switching dictionaries."""
+    zstandard = pytest.importorskip("zstandard")
+    from surreality_logging import train_dictionary
+
+    def trained_dictionary(name, word):
+        sample_file = tmp_path / name
+        sample_file.write_text(
+            "".join(f"2025-11-09 01:38:06.{i % 1000:03d} | INFO     | app.{word}:handle:{i % 50} - {word} {i} done\n"
+                    for i in range(2000)),
+            encoding="utf-8",
+        )
+        return train_dictionary([str(sample_file)], dict_size=4096)
+
+    def decompress(path):
+        dict_id = zstandard.get_frame_parameters(path.read_bytes()).dict_id
+        dict_data = (log_dir / f"app.log.{dict_id}.zst.dict").read_bytes()
+        decompressor = zstandard.ZstdDecompressor(dict_data=zstandard.ZstdCompressionDict(dict_data))
+        with open(path, "rb") as f:
+            return decompressor.stream_reader(f).read().decode("utf-8")
+
+    log_dir = tmp_path / "logs"
+    log_file = log_dir / "app.log"
+    archives = []
+    dictionaries = [trained_dictionary("first.log", "first"), trained_dictionary("second.log", "second")]
+    for run, compression_dict in enumerate(dictionaries):
+        configure_logging(
+            "INFO", colorize=False, log_file=str(log_file), max_bytes=1024, backup_count=100, enqueue=False,
+            compression_dict=compression_dict,
+        )
+        for i in range(50):
+            logger.info("Dictionary run {} message {}", run, i)
+        logger.remove()
+        _wait_for_background_compression()
+        archives.append(set(log_dir.glob("app.*.log.zst")) - set().union(*archives))
+
+    assert len(list(log_dir.glob("app.log.*.zst.dict"))) == 2
+    assert "Dictionary run 0 message 0" in decompress(min(archives[0]))
+    assert "Dictionary run 1 message 0" in decompress(min(archives[1]))
+
+
+def test_file_logging_zstd_dictionary_templated_path(tmp_path):
+    """Test the dictionary saved for a templated log path gets a real file name."""
+    pytest.importorskip("zstandard")
+    from surreality_logging import train_dictionary
+
+    sample_file = tmp_path / "sample.txt"
+    sample_file.write_text(
+        "".join(f"2025-11-09 01:38:06.{i % 1000:03d} | INFO     | app.api:handle:{i % 50} - Request {i}\n"
+                for i in range(2000)),
+        encoding="utf-8",
+    )
+    compression_dict = train_dictionary([str(sample_file)], dict_size=4096)
+
+    configure_logging(
+        "INFO", colorize=False, log_file=str(tmp_path / "app_{time}.log"), enqueue=False, quiet=True,
+        compression_dict=compression_dict,
+    )
+    logger.remove()
+
+    saved = list(tmp_path.glob("app_*.log.*.zst.dict"))
+    assert len(saved) == 1
+    assert "{" not in saved[0].name
+    assert saved[0].read_bytes() == compression_dict
+
+
+@pytest.mark.skipif(not hasattr(__import__("os"), "fork"), reason="requires os.fork")
+def test_forked_child_does_not_wait_for_parent_compression():
+    """Test a forked child doesn't block at exit on compressions pending in its parent."""
+    import os
+    import threading
+    import time
+    from surreality_logging import _run_in_background
+
+    release = threading.Event()
+    _run_in_background(release.wait)()
+
+    pid = os.fork()
+    if pid == 0:
+        # Same hook atexit runs; it must not wait on the parent's future
+        _wait_for_background_compression()
+        os._exit(0)
+
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            finished, status = os.waitpid(pid, os.WNOHANG)
+            if finished:
+                break
+            time.sleep(0.05)
+        else:
+            os.kill(pid, 9)
+            os.waitpid(pid, 0)
+            pytest.fail("forked child blocked on the parent's pending compression")
+        assert os.WEXITSTATUS(status) == 0
+    finally:
+        release.set()
+        _wait_for_background_compression()
+
+
+def test_file_logging_retention(tmp_path):
+    """Test background retention keeps at most backup_count rotated files."""
+    log_file = tmp_path / "app.log"
+    configure_logging(
+        "INFO", colorize=False, log_file=str(log_file), max_bytes=512, backup_count=2, enqueue=False
+    )
+
+    for i in range(100):
+        logger.info("Retention message {}", i)
+    logger.remove()
+    _wait_for_background_compression()
+
+    assert len(list(tmp_path.glob("app.*.log.*"))) == 2
+    assert not list(tmp_path.glob("app.*.log"))
+
+
+def test_file_logging_retention_templated_path(tmp_path):
+    """Test background retention also prunes files of a templated log path."""
+    configure_logging(
+        "INFO", colorize=False, log_file=str(tmp_path / "app_{time}.log"), max_bytes=512, backup_count=2,
+        enqueue=False, quiet=True,
+    )
+
+    for i in range(100):
+        logger.info("Templated retention message {}", i)
+    logger.remove()
+    _wait_for_background_compression()
+
+    assert len(list(tmp_path.glob("app_*.log.*"))) == 2
+    assert len(list(tmp_path.glob("app_*.log"))) == 1
+
+
 if __name__ == "__main__":
     # Run tests manually
     test_configure_logging()
     test_logger_levels()
+    test_configure_logging_is_idempotent()
     test_intercept_standard_logging()
+    test_intercept_reports_caller()
+    test_intercept_message_passthrough()
+    test_intercept_skips_filtered_records()
+    test_intercept_defers_formatting_for_disabled_modules()
+    test_uvicorn_log_config()
+    test_uvicorn_log_config_is_picklable()
     print("All tests passed!")